@@ -1,9 +1,24 @@
 import pymel.core as pm
 import pymel.util as pu
 import maya.cmds as cmds
+import maya.mel as mel
+import maya.api.OpenMaya as om
 import sys
+import os
+import re
+import math
+import struct
+import timeit
+import hashlib
+import tempfile
+import wave
 import logging
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 """
 // Image Plane Manager
 // version 1.0
@@ -23,6 +38,9 @@ import logging
 	
     PRO FEATURES
         - manipulator for free movement in relation to camera space
+        - auto layout of all image planes of a camera in a grid
+        - audio import linked to the plate camera with cached waveform peaks
+        - health scan ranking image planes by viewport cost, with bulk fixes
         
 	INSTALLATION:
 	a) Copy the file (mo_imageplaneManager.py) to your Maya scripts directory. 
@@ -43,7 +61,6 @@ import logging
 	 - set  camera to persp as default when importing
      - on import/delete, change create command to createEdit UI, not redraw whole interface,
      - edit image plane, change size, align to left/right
-     - audio import
 
 	VERSIONS:
 	1.0 - Jan 07, 2017 - Initial Release.
@@ -57,6 +74,671 @@ debug = False
 _logger = logging.getLogger(__name__)
 pro=1
 
+
+###########################
+# plate layout: arrange many image planes on one camera film back
+###########################
+def gridLayout(aspects, frameWidth, frameHeight, padding=0.02):
+    """Compute non overlapping offsets and sizes for a list of plates.
+
+    aspects -- width/height ratio of every plate
+    frameWidth, frameHeight -- film back of the camera in inches
+    padding -- gap between cells as fraction of the cell size
+
+    Returns a list of (offsetX, offsetY, sizeX, sizeY) in inches, row by row
+    starting top left, centered on the film back.
+    """
+    count = len(aspects)
+    if count == 0:
+        return []
+
+    # pick the column count whose cells best match the median plate aspect
+    medianAspect = sorted(aspects)[count//2]
+    bestCols, bestArea = 1, -1.0
+    for cols in range(1, count+1):
+        rows = int(math.ceil(count/float(cols)))
+        cellW = frameWidth/cols
+        cellH = frameHeight/rows
+        area = min(cellW, cellH*medianAspect) * min(cellH, cellW/medianAspect)
+        if area > bestArea:
+            bestCols, bestArea = cols, area
+        if rows == 1:
+            break
+
+    cols = bestCols
+    rows = int(math.ceil(count/float(cols)))
+    cellW = frameWidth/cols
+    cellH = frameHeight/rows
+    innerW = cellW*(1.0-padding)
+    innerH = cellH*(1.0-padding)
+
+    layout = []
+    for i, aspect in enumerate(aspects):
+        row, col = divmod(i, cols)
+        sizeX = min(innerW, innerH*aspect)
+        sizeY = sizeX/aspect
+        offsetX = -frameWidth/2.0 + cellW*(col+0.5)
+        offsetY = frameHeight/2.0 - cellH*(row+0.5)
+        layout.append((offsetX, offsetY, sizeX, sizeY))
+    return layout
+
+
+def benchmarkLayout(count=500, repeat=10):
+    """Time gridLayout alone for count plates, returns best run in seconds."""
+    aspects = [1.0 + (i % 7)*0.25 for i in range(count)]
+    timer = timeit.Timer(lambda: gridLayout(aspects, 1.417, 0.945))
+    best = min(timer.repeat(repeat=repeat, number=1))
+    print('imp: gridLayout %d plates: %.3f ms' % (count, best*1000.0))
+    return best
+
+
+###########################
+# camera space math: image plane offset/size (film back inches) <-> mover xform
+###########################
+MM_PER_INCH = 25.4
+
+FILMFIT_FILL = 0
+FILMFIT_HORIZONTAL = 1
+FILMFIT_VERTICAL = 2
+FILMFIT_OVERSCAN = 3
+
+
+def _requireNumpy():
+    if np is None:
+        raise ImportError('imp: numpy is required for camera space conversions.')
+
+
+def moverFactor(focalLength, depth):
+    """Scene units per film back inch for a mover at depth in front of the camera."""
+    return MM_PER_INCH*depth/focalLength
+
+
+def filmGate(horizontalAperture, verticalAperture, filmFit, renderAspect, lensSqueeze=1.0):
+    """Width and height in inches of the film back area that frames the render.
+
+    All arguments take scalars or arrays of cameras. filmFit uses the camera
+    filmFit enum (fill, horizontal, vertical, overscan).
+    """
+    _requireNumpy()
+    width = np.asarray(horizontalAperture, dtype=float)*lensSqueeze
+    height = np.asarray(verticalAperture, dtype=float)
+    filmFit = np.asarray(filmFit)
+    renderAspect = np.asarray(renderAspect, dtype=float)
+
+    wider = renderAspect >= width/height
+    horizontal = ((filmFit == FILMFIT_HORIZONTAL) |
+                  ((filmFit == FILMFIT_FILL) & wider) |
+                  ((filmFit == FILMFIT_OVERSCAN) & ~wider))
+    gateWidth = np.where(horizontal, width, height*renderAspect)
+    gateHeight = np.where(horizontal, width/renderAspect, height)
+    return gateWidth, gateHeight
+
+
+def planeToMover(offset, size, focalLength, depth=None):
+    """Convert plane offsets and sizes (N,2) to mover translate and scale (N,3).
+
+    depth defaults to half the focal length like createMover.
+    """
+    _requireNumpy()
+    offset = np.atleast_2d(np.asarray(offset, dtype=float))
+    size = np.atleast_2d(np.asarray(size, dtype=float))
+    focalLength = np.asarray(focalLength, dtype=float)
+    depth = focalLength/2.0 if depth is None else np.asarray(depth, dtype=float)
+    depth = np.broadcast_to(depth, offset.shape[:1])
+
+    translate = np.empty((offset.shape[0], 3))
+    translate[:, :2] = offset*moverFactor(focalLength, depth)[..., None]
+    translate[:, 2] = -depth
+    scale = np.ones((size.shape[0], 3))
+    scale[:, :2] = size
+    return translate, scale
+
+
+def moverToPlane(translate, scale, focalLength):
+    """Inverse of planeToMover, returns plane offsets and sizes (N,2)."""
+    _requireNumpy()
+    translate = np.atleast_2d(np.asarray(translate, dtype=float))
+    scale = np.atleast_2d(np.asarray(scale, dtype=float))
+    factor = moverFactor(np.asarray(focalLength, dtype=float), -translate[:, 2])
+    return translate[:, :2]/factor[..., None], scale[:, :2].copy()
+
+
+def retargetPlanes(offset, size, sourceGate, targetGate):
+    """Rescale plane offsets and sizes (N,2) from one film gate to another.
+
+    Gates are (width, height) as returned by filmGate, so the plate keeps
+    the same framing relative to the rendered image.
+    """
+    _requireNumpy()
+    ratio = np.stack([np.asarray(targetGate[0], dtype=float)/sourceGate[0],
+                      np.asarray(targetGate[1], dtype=float)/sourceGate[1]], axis=-1)
+    return np.asarray(offset, dtype=float)*ratio, np.asarray(size, dtype=float)*ratio
+
+
+def cameraGate(camera):
+    """filmGate of a camera transform or shape, uses the scene render aspect."""
+    cameraShape = cmds.ls(camera, dag=1, type='camera')[0]
+    return filmGate(cmds.getAttr('%s.horizontalFilmAperture'%cameraShape),
+                    cmds.getAttr('%s.verticalFilmAperture'%cameraShape),
+                    cmds.getAttr('%s.filmFit'%cameraShape),
+                    cmds.getAttr('defaultResolution.deviceAspectRatio'),
+                    cmds.getAttr('%s.lensSqueezeRatio'%cameraShape))
+
+
+def benchmarkCameraSpace(count=10000, repeat=10):
+    """Time count plane->mover->plane round trips plus a retarget, returns best run in seconds."""
+    _requireNumpy()
+    offset = np.random.uniform(-1, 1, (count, 2))
+    size = np.random.uniform(0.1, 2, (count, 2))
+    focalLength = np.random.uniform(18, 85, count)
+    sourceGate = filmGate(np.full(count, 1.417), 0.945, np.random.randint(0, 4, count), 1.778)
+    targetGate = filmGate(np.full(count, 0.980), 0.735, np.random.randint(0, 4, count), 1.778)
+
+    def run():
+        translate, scale = planeToMover(offset, size, focalLength)
+        planeOffset, planeSize = moverToPlane(translate, scale, focalLength)
+        retargetPlanes(planeOffset, planeSize, sourceGate, targetGate)
+
+    best = min(timeit.Timer(run).repeat(repeat=repeat, number=1))
+    print('imp: camera space %d conversions: %.3f ms' % (count, best*1000.0))
+    return best
+
+
+###########################
+# manager selection stored in the scene so reopening keeps the current plane
+###########################
+STATE_KEY = 'mo_imageplaneManager'
+STATE_VERSION = 3
+
+
+def loadSelection():
+    """Return the image plane stored as current in the scene, None if missing or of another schema version."""
+    stored = cmds.fileInfo(STATE_KEY, q=1)
+    if not stored:
+        return None
+    version, _, current = stored[0].partition(' ')
+    if version != str(STATE_VERSION) or not current:
+        return None
+    return current
+
+
+def saveSelection(current):
+    """Store the current image plane in the scene file info.
+
+    The write is skipped when unchanged, kept off the undo queue and does
+    not mark the scene modified.
+    """
+    if current is None or loadSelection() == current:
+        return
+    undoState = cmds.undoInfo(q=1, stateWithoutFlush=1)
+    modified = cmds.file(q=1, modified=1)
+    cmds.undoInfo(stateWithoutFlush=False)
+    try:
+        cmds.fileInfo(STATE_KEY, '%d %s'%(STATE_VERSION, current))
+    finally:
+        cmds.undoInfo(stateWithoutFlush=undoState)
+        if not modified:
+            cmds.file(modified=0)
+
+
+###########################
+# audio: waveform peaks from wav, cached on disk
+###########################
+AUDIO_PEAKS_PER_SECOND = 100
+
+
+def cacheDir():
+    """Directory for files derived from plates and audio, created on demand."""
+    path = os.path.join(cmds.internalVar(userAppDir=True), 'mo_imageplaneManager', 'cache')
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    return path
+
+
+def _pcmSamples(data, sampleWidth):
+    # little endian pcm bytes to integer samples and their full scale value
+    if sampleWidth == 1:
+        return np.frombuffer(data, dtype=np.uint8).astype(np.int16) - 128, 128.0
+    if sampleWidth == 2:
+        return np.frombuffer(data, dtype='<i2'), 32768.0
+    if sampleWidth == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        return (samples << 8) >> 8, 8388608.0
+    if sampleWidth == 4:
+        return np.frombuffer(data, dtype='<i4'), 2147483648.0
+    raise ValueError('imp: Unsupported wav sample width %d' % sampleWidth)
+
+
+def readWavPeaks(path, peaksPerSecond=AUDIO_PEAKS_PER_SECOND, chunkPeaks=1024):
+    """Stream a pcm wav file and return its (min, max) peaks as float32 array (N,2).
+
+    Only chunkPeaks peaks worth of frames are decoded at a time.
+    """
+    _requireNumpy()
+    wav = wave.open(path, 'rb')
+    try:
+        channels = wav.getnchannels()
+        sampleWidth = wav.getsampwidth()
+        framesPerPeak = max(1, int(wav.getframerate() / peaksPerSecond))
+        fullScale = 1.0
+        peaks = []
+        while True:
+            data = wav.readframes(framesPerPeak * chunkPeaks)
+            if not data:
+                break
+            samples, fullScale = _pcmSamples(data, sampleWidth)
+            samples = samples.reshape(-1, channels)
+            full = len(samples) // framesPerPeak * framesPerPeak
+            if full:
+                block = samples[:full].reshape(-1, framesPerPeak * channels)
+                peaks.append(np.stack([block.min(axis=1), block.max(axis=1)], axis=1))
+            if full < len(samples):
+                peaks.append(np.array([[samples[full:].min(), samples[full:].max()]]))
+    finally:
+        wav.close()
+    if not peaks:
+        return np.zeros((0, 2), dtype=np.float32)
+    return (np.concatenate(peaks) / fullScale).astype(np.float32)
+
+
+def peaksCachePath(path, peaksPerSecond=AUDIO_PEAKS_PER_SECOND):
+    """Cache file for the peaks of path, keyed on path, size and modification time."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    key = '%s|%d|%d|%d' % (path, stat.st_size, int(stat.st_mtime), peaksPerSecond)
+    return os.path.join(cacheDir(), 'peaks_%s.npy' % hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+
+def waveformPeaks(path, peaksPerSecond=AUDIO_PEAKS_PER_SECOND):
+    """readWavPeaks through the disk cache, repeat loads skip decoding."""
+    _requireNumpy()
+    cacheFile = peaksCachePath(path, peaksPerSecond)
+    if os.path.isfile(cacheFile):
+        try:
+            return np.load(cacheFile)
+        except (IOError, ValueError):
+            _logger.debug('waveformPeaks: unreadable cache %s' % cacheFile)
+    peaks = readWavPeaks(path, peaksPerSecond)
+    np.save(cacheFile, peaks)
+    return peaks
+
+
+def audioPeaks(audio, decode=True):
+    """Waveform peaks of an audio node, loaded from the cache file stored in its peaksCache attribute.
+
+    A missing or stale cache is decoded again when decode is True, else None is returned.
+    """
+    _requireNumpy()
+    path = cmds.sound(audio, q=1, file=1)
+    if not path or not path.lower().endswith('.wav') or not os.path.isfile(path):
+        return None
+    cacheFile = peaksCachePath(path)
+    stored = cmds.getAttr('%s.peaksCache'%audio) if cmds.attributeQuery('peaksCache', node=audio, exists=True) else None
+    if stored == cacheFile and os.path.isfile(stored):
+        return np.load(stored)
+    if not decode:
+        return None
+    peaks = waveformPeaks(path)
+    if not cmds.attributeQuery('peaksCache', node=audio, exists=True):
+        cmds.addAttr(audio, longName='peaksCache', dataType='string')
+    cmds.setAttr('%s.peaksCache'%audio, cacheFile, type='string')
+    return peaks
+
+
+def audioLabel(audio):
+    """Audio node name with its peak level from the cached waveform, never decodes."""
+    try:
+        peaks = audioPeaks(audio, decode=False) if np is not None else None
+    except (IOError, OSError, ValueError):
+        peaks = None
+    if peaks is None or not len(peaks):
+        return audio
+    level = float(np.abs(peaks).max())
+    if level <= 0:
+        return '%s (silent)' % audio
+    return '%s (%.1f dB)' % (audio, 20*math.log10(level))
+
+
+def benchmarkWaveform(minutes=10, rate=48000, channels=2):
+    """Write a test wav of the given length and time decoding its peaks.
+
+    Returns (seconds, peak bytes). Peak memory comes from tracemalloc where
+    available, else from the growth of the process max resident size (only
+    growth above the earlier high water mark shows, so run it in a fresh
+    session), and is None on platforms that have neither.
+    """
+    _requireNumpy()
+    path = os.path.join(tempfile.gettempdir(), 'imp_benchmark_%dmin.wav' % minutes)
+    wav = wave.open(path, 'wb')
+    try:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        second = np.arange(rate) / float(rate)
+        tone = (np.sin(2*np.pi*440*second) * 16000).astype('<i2')
+        block = np.repeat(tone[:, None], channels, axis=1).tobytes()
+        for i in range(int(minutes*60)):
+            wav.writeframes(block)
+    finally:
+        wav.close()
+
+    try:
+        import tracemalloc
+    except ImportError:
+        tracemalloc = None
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    # ru_maxrss is in kilobytes on linux and bytes on mac
+    rssUnit = 1 if sys.platform == 'darwin' else 1024
+    try:
+        if tracemalloc:
+            tracemalloc.start()
+        elif resource:
+            rssBefore = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = timeit.default_timer()
+        readWavPeaks(path)
+        seconds = timeit.default_timer() - start
+        if tracemalloc:
+            peakMemory = tracemalloc.get_traced_memory()[1]
+        elif resource:
+            peakMemory = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rssBefore) * rssUnit
+        else:
+            peakMemory = None
+    finally:
+        if tracemalloc:
+            tracemalloc.stop()
+        os.remove(path)
+    print('imp: decoding %d min wav: %.3f s, peak memory %s' % (minutes, seconds,
+          '%.1f MB' % (peakMemory/1048576.0) if peakMemory is not None else 'n/a'))
+    return seconds, peakMemory
+
+
+###########################
+# health scan: estimate viewport and DG cost of every image plane
+###########################
+MOVIE_COST = 2.0        # movies are decoded on the cpu every frame
+SEQUENCE_COST = 1.5     # sequences upload a new texture every frame
+ALL_VIEWS_COST = 2.0    # drawn in every viewport instead of the current one
+MOVER_COST = 0.05       # mover transform and multiplyDivide evaluated in the DG
+PROXY_DIR = 'proxy'     # proxies live in a 'proxy' folder next to the full res plate
+MOVER_TAG = 'impMover'  # marker attribute createMover adds to its mover and multiplyDivide
+
+_headerCache = {}
+_dirCache = {}
+_sequenceCache = {}
+
+
+def _pngSize(header):
+    if header[:8] == b'\x89PNG\r\n\x1a\n' and header[12:16] == b'IHDR':
+        return struct.unpack('>II', header[16:24])
+    return None
+
+
+def _jpegSize(f):
+    f.seek(2)
+    while True:
+        marker = f.read(4)
+        if len(marker) < 4 or marker[0:1] != b'\xff':
+            return None
+        code = ord(marker[1:2])
+        length = struct.unpack('>H', marker[2:4])[0]
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>xHH', f.read(5))
+            return width, height
+        f.seek(length-2, 1)
+
+
+def _readCString(f):
+    chars = []
+    char = f.read(1)
+    while char not in (b'', b'\x00'):
+        chars.append(char)
+        char = f.read(1)
+    return b''.join(chars)
+
+
+def _exrSize(f):
+    f.seek(8)
+    while True:
+        name = _readCString(f)
+        if not name:
+            return None
+        attrType = _readCString(f)
+        size = struct.unpack('<i', f.read(4))[0]
+        if name == b'dataWindow' and attrType == b'box2i':
+            xMin, yMin, xMax, yMax = struct.unpack('<iiii', f.read(16))
+            return xMax-xMin+1, yMax-yMin+1
+        f.seek(size, 1)
+
+
+def imageResolution(path):
+    """Width and height read from a png, jpeg or exr header, None if unknown."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime)
+    if key not in _headerCache:
+        resolution = None
+        try:
+            f = open(path, 'rb')
+            try:
+                header = f.read(24)
+                if header[:8] == b'\x89PNG\r\n\x1a\n':
+                    resolution = _pngSize(header)
+                elif header[:2] == b'\xff\xd8':
+                    resolution = _jpegSize(f)
+                elif header[:4] == b'\x76\x2f\x31\x01':
+                    resolution = _exrSize(f)
+            finally:
+                f.close()
+        except (IOError, struct.error):
+            resolution = None
+        _headerCache[key] = resolution
+    return _headerCache[key]
+
+
+def sequenceLength(path):
+    """Number of frames on disk sharing the name and extension of path.
+
+    Zero padded frame numbers only match the same width, unpadded ones any width.
+    """
+    directory, basename = os.path.split(path)
+    match = re.match(r'^(.*?)(\d+)(\.[^.]+)$', basename)
+    if not match:
+        return 1
+    frame = match.group(2)
+    padding = len(frame) if frame.startswith('0') and len(frame) > 1 else 0
+    key = (directory, match.group(1), padding, match.group(3))
+    if key not in _sequenceCache:
+        if directory not in _dirCache:
+            try:
+                _dirCache[directory] = os.listdir(directory or '.')
+            except OSError:
+                _dirCache[directory] = []
+        digits = r'\d{%d}' % padding if padding else r'\d+'
+        pattern = re.compile(r'^%s%s%s$' % (re.escape(match.group(1)), digits, re.escape(match.group(3))))
+        _sequenceCache[key] = max(1, len([f for f in _dirCache[directory] if pattern.match(f)]))
+    return _sequenceCache[key]
+
+
+def proxyPath(path):
+    return os.path.join(os.path.dirname(path), PROXY_DIR, os.path.basename(path))
+
+
+def findMoverNodes():
+    """Long names of all mover transforms and multiplyDivide nodes made by createMover.
+
+    Nodes are tagged with MOVER_TAG, untagged movers from older versions are
+    only picked up as <name>_mover / <name>_moveroffset pairs.
+    """
+    nodes = set(cmds.ls('*.%s'%MOVER_TAG, objectsOnly=1, long=1) or [])
+    offsets = cmds.ls('*_moveroffset', type='multiplyDivide') or []
+    for offset in offsets:
+        mover = cmds.ls('%s_mover'%offset[:-len('_moveroffset')], type='transform', long=1)
+        if len(mover) == 1:
+            nodes.update(mover)
+            nodes.update(cmds.ls(offset, long=1))
+    return sorted(nodes)
+
+
+def findDeadMovers():
+    """Mover nodes made by createMover that no longer drive an image plane."""
+    nodes = findMoverNodes()
+    if not nodes:
+        return []
+    connections = cmds.listConnections(nodes, source=0, destination=1, type='imagePlane', connections=1) or []
+    live = set(cmds.ls([plug.split('.')[0] for plug in connections[::2]], long=1) or [])
+    return [node for node in nodes if node not in live]
+
+
+def readImagePlaneAttrs(imps):
+    """Read the attributes the health scan needs for all planes through one selection list.
+
+    Returns one (imageName, type, useFrameExtension, displayOnlyIfCurrent,
+    coverageX, coverageY, hasMover) tuple per plane. hasMover is only set when
+    sizeX is driven by a createMover node, not by keys or expressions.
+    """
+    selection = om.MSelectionList()
+    for imp in imps:
+        selection.add(imp)
+    fn = om.MFnDependencyNode()
+    sourceFn = om.MFnDependencyNode()
+    rows = []
+    for i in range(selection.length()):
+        fn.setObject(selection.getDependNode(i))
+        hasMover = False
+        for source in fn.findPlug('sizeX', False).connectedTo(True, False):
+            sourceFn.setObject(source.node())
+            if sourceFn.hasAttribute(MOVER_TAG) or sourceFn.name() == '%s_mover'%fn.name():
+                hasMover = True
+        rows.append((
+            fn.findPlug('imageName', False).asString(),
+            fn.findPlug('type', False).asShort(),
+            fn.findPlug('useFrameExtension', False).asBool(),
+            fn.findPlug('displayOnlyIfCurrent', False).asBool(),
+            fn.findPlug('coverageX', False).asInt(),
+            fn.findPlug('coverageY', False).asInt(),
+            hasMover,
+        ))
+    return rows
+
+
+def scanImagePlanes(imps=None):
+    """Estimate the cost of image planes and return them ranked, most expensive first.
+
+    Every entry is a dict with imagePlane, path, type, width, height, frames,
+    showInAllViews, mover, duplicate and cost (megapixel equivalents per frame).
+    """
+    if imps is None:
+        imps = ImagePlaneMngWindow.findImagePlanes()
+    if not imps:
+        return []
+
+    entries = []
+    sources = {}
+    resolutions = {}
+    #directory listings can change between scans, headers are keyed on mtime
+    _dirCache.clear()
+    _sequenceCache.clear()
+    rows = readImagePlaneAttrs(imps)
+    for imp, (path, impType, useFrameExtension, displayOnlyIfCurrent, coverageX, coverageY, hasMover) in zip(imps, rows):
+        #headers are read once per source file, shared plates reuse it
+        if impType == 2 or not path:
+            resolution = None
+        else:
+            if path not in resolutions:
+                resolutions[path] = imageResolution(path)
+            resolution = resolutions[path]
+        if resolution is None:
+            resolution = (coverageX, coverageY)
+        frames = sequenceLength(path) if useFrameExtension else 1
+        entry = {
+            'imagePlane': imp,
+            'path': path,
+            'type': ('image', 'texture', 'movie')[impType] if impType in (0, 1, 2) else impType,
+            'width': resolution[0],
+            'height': resolution[1],
+            'frames': frames,
+            'showInAllViews': not displayOnlyIfCurrent,
+            'mover': hasMover,
+            'duplicate': False,
+        }
+        cost = resolution[0]*resolution[1]/1000000.0
+        if impType == 2:
+            cost *= MOVIE_COST
+        if frames > 1:
+            cost *= SEQUENCE_COST
+        if entry['showInAllViews']:
+            cost *= ALL_VIEWS_COST
+        if entry['mover']:
+            cost += MOVER_COST
+        entry['cost'] = cost
+        if path:
+            sources.setdefault(os.path.normcase(os.path.abspath(path)), []).append(entry)
+        entries.append(entry)
+
+    for shared in sources.values():
+        if len(shared) > 1:
+            for entry in shared:
+                entry['duplicate'] = True
+
+    entries.sort(key=lambda entry: entry['cost'], reverse=True)
+    return entries
+
+
+def fixUseProxies(imps):
+    """Point image planes at the file of the same name in the proxy folder, returns the switched planes."""
+    switched = []
+    for imp in imps:
+        path = cmds.getAttr('%s.imageName'%imp) or ''
+        proxy = proxyPath(path)
+        if not path or os.path.basename(os.path.dirname(path)) == PROXY_DIR or not os.path.isfile(proxy):
+            continue
+        if not cmds.attributeQuery('fullResImage', node=imp, exists=True):
+            cmds.addAttr(imp, longName='fullResImage', dataType='string')
+        cmds.setAttr('%s.fullResImage'%imp, path, type='string')
+        cmds.setAttr('%s.imageName'%imp, proxy, type='string')
+        switched.append(imp)
+    print('imp: Switched %d of %d image planes to proxies'%(len(switched), len(imps)))
+    return switched
+
+
+def fixRemoveDeadMovers():
+    dead = findDeadMovers()
+    if dead:
+        cmds.delete(dead)
+    print('imp: Removed %d dead mover nodes'%len(dead))
+    return dead
+
+
+def fixCurrentViewOnly(imps):
+    for imp in imps:
+        cmds.imagePlane(imp, e=1, showInAllViews=0)
+    print('imp: Set %d image planes to current view only'%len(imps))
+    return imps
+
+
+def benchmarkHealthScan(count=1000, repeat=3):
+    """Time scanImagePlanes on count image planes, returns best run in seconds.
+
+    Builds the planes on persp in a new scene, so it refuses to run while
+    the current scene has unsaved changes.
+    """
+    if cmds.file(q=1, modified=1):
+        raise RuntimeError('imp: Save the scene before running benchmarkHealthScan, it opens a new scene.')
+    cmds.file(new=True, force=True)
+    for i in range(count):
+        cmds.imagePlane(camera='persp', name='benchPlate%d'%i)
+
+    best = min(timeit.Timer(scanImagePlanes).repeat(repeat=repeat, number=1))
+    print('imp: health scan of %d image planes: %.3f s' % (len(cmds.ls(type='imagePlane')), best))
+    return best
+
+
 class ImagePlaneMngWindow(object):
     """pymel class for Image plane manger 2.0"""
 
@@ -243,8 +925,9 @@ class ImagePlaneMngWindow(object):
             width=self.WINDOW_SIZE[0],
             borderStyle='etchedIn'
         )
+        self.createAudioUI()
+
         self.audioGrpForm = pm.formLayout(nd=100)
-        #self.audioGrpForm = pm.formLayout(nd=100)
         #attach 'Manage Plane Manages control'  group to main
         pm.formLayout(
             self.mainForm, e=True,
@@ -330,8 +1013,16 @@ class ImagePlaneMngWindow(object):
             pm.button(label='Move and Scale', en=pro, command=pm.Callback(self.on_move_btn))
             pm.button(label='Duplicate',  w=20, en=pro, command=pm.Callback(self.on_duplicate_btn))
             pm.button(label='Disconnect Mover', en=pro,  w=20, command=pm.Callback(self.on_disconnectMover_btn))
+            pm.button(label='Auto Layout', en=pro, w=20, command=pm.Callback(self.on_autolayout_btn))
+            pm.button(label='Health Scan', en=pro, w=20, command=pm.Callback(self.healthWindowUI))
             #pm.setParent(self.cameraGrpForm)
 
+    def createAudioUI(self, *args):
+        self.audioGrpRow = pm.rowLayout(numberOfColumns=2, columnWidth2=(120, 200), columnAlign2=('left', 'left'))
+        pm.button(label='Import Audio', width=110, command=pm.Callback(self.on_audio_btn))
+        self.audioTxt = pm.text(label='  '.join([audioLabel(audio) for audio in cmds.ls(type='audio')]) or 'No audio in scene', align='left')
+        pm.setParent(self.audioGrpFrame)
+
     def importWindowUI(self,*args):
 
         #query main window position for alignment
@@ -364,7 +1055,55 @@ class ImagePlaneMngWindow(object):
 
         pm.showWindow()
 
-    #find image planes in scenes -----notinuse
+    def healthWindowUI(self, *args):
+
+        posMainWindow = pm.window(self.WINDOW_NAME, query=True, topLeftCorner=True)
+        try:
+            pm.deleteUI('mo_imageplanehealth', window=True)
+        except: pass
+
+        self.healthWindow = pm.window('mo_imageplanehealth', title="Image Plane Health", widthHeight=(520, 320), topLeftCorner=posMainWindow)
+        pm.columnLayout(adjustableColumn=True)
+        self.healthList = pm.textScrollList(height=250, font='fixedWidthFont')
+        pm.rowLayout(numberOfColumns=4)
+        pm.button(label='Use Proxies', width=120, command=pm.Callback(self.on_health_fix, 'proxy'))
+        pm.button(label='Remove Dead Movers', width=130, command=pm.Callback(self.on_health_fix, 'movers'))
+        pm.button(label='Current View Only', width=120, command=pm.Callback(self.on_health_fix, 'views'))
+        pm.button(label='Rescan', width=80, command=pm.Callback(self.updateHealthList))
+        self.updateHealthList()
+        pm.showWindow()
+
+    def updateHealthList(self, *args):
+        self.healthEntries = scanImagePlanes()
+        pm.textScrollList(self.healthList, e=1, removeAll=1)
+        for entry in self.healthEntries:
+            flags = ''.join([
+                ' seq' if entry['frames'] > 1 else '',
+                ' allviews' if entry['showInAllViews'] else '',
+                ' mover' if entry['mover'] else '',
+                ' duplicate' if entry['duplicate'] else '',
+            ])
+            pm.textScrollList(self.healthList, e=1, append='%8.2f  %-24s %5dx%-5d %-7s %5d%s' % (
+                entry['cost'], entry['imagePlane'], entry['width'], entry['height'], entry['type'], entry['frames'], flags))
+        dead = findDeadMovers()
+        if dead:
+            pm.textScrollList(self.healthList, e=1, append='dead mover nodes: %s' % ' '.join(dead))
+
+    def on_health_fix(self, fix, *args):
+        imps = [entry['imagePlane'] for entry in self.healthEntries]
+        cmds.undoInfo(openChunk=True)
+        try:
+            if fix == 'proxy':
+                fixUseProxies(imps)
+            elif fix == 'movers':
+                fixRemoveDeadMovers()
+            elif fix == 'views':
+                fixCurrentViewOnly(imps)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        self.updateHealthList()
+
+    #find image planes in scenes
     @classmethod
     def findImagePlanes(self,*args):
         imgPlanes= cmds.ls(type="imagePlane")
@@ -390,22 +1129,29 @@ class ImagePlaneMngWindow(object):
             print 'imp: Creating mover for %s'%self.currentImgPlane[0]
             #mover = pm.spaceLocator(name='%s_mover'%self.currentImgPlane[0])
             mover = pm.createNode('transform', name='%s_mover'%self.currentImgPlane[0])
+            pm.addAttr(mover, longName=MOVER_TAG, attributeType='bool')
 
 
             #parent to camera and align to image plane
             camera = pm.listRelatives(pm.imagePlane(imp, q=1, camera=1), p=True)
             pm.parent(mover, camera)
+
+            #distance from camera relative to focal length, offsets scaled so the mover sits on the plate
+            focalLength = pm.getAttr('%s.focalLength'%camera[0].name())
+            moverTranslate, moverScale = planeToMover(
+                [pm.getAttr('%s.offsetX'%imp), pm.getAttr('%s.offsetY'%imp)],
+                [pm.getAttr('%s.sizeX'%imp), pm.getAttr('%s.sizeY'%imp)],
+                focalLength)
+            depth = -float(moverTranslate[0][2])
+            factor = moverFactor(focalLength, depth)
             if translation is None:
-                mover.tx.set(pm.getAttr('%s.offsetX'%imp)*10)
-                mover.ty.set(pm.getAttr('%s.offsetY'%imp)*10)
+                mover.translate.set([float(value) for value in moverTranslate[0]])
             else:
                 pm.xform(mover, translation = translation )
-
-            #set distance from camera relative to focal length
-            mover.tz.set(-1*(pm.getAttr('%s.focalLength'%camera[0].name())/2))
+                mover.tz.set(-1*depth)
 
             if scale is None:
-                mover.scale.set(pm.getAttr('%s.sizeX'%imp), pm.getAttr('%s.sizeY'%imp), 1)
+                mover.scale.set([float(value) for value in moverScale[0]])
             else:
                 pm.xform(mover, scale=scale)
             mover.rotate.set([0,0,0])
@@ -413,8 +1159,9 @@ class ImagePlaneMngWindow(object):
             #connect imageplane to mover
             moveroffset = pm.shadingNode('multiplyDivide', asUtility=1, n='%s_moveroffset'%imp)
             moveroffset.operation.set(2)
-            moveroffset.input2X.set(10)
-            moveroffset.input2Y.set(10)
+            pm.addAttr(moveroffset, longName=MOVER_TAG, attributeType='bool')
+            moveroffset.input2X.set(factor)
+            moveroffset.input2Y.set(factor)
             mover.tx >> moveroffset.input1X
             mover.ty >> moveroffset.input1Y
 
@@ -428,6 +1175,95 @@ class ImagePlaneMngWindow(object):
             return mover
 
 
+    ###########################
+    # arrange all image planes of a camera in a grid on its film back
+    ###########################
+    def autoLayout(self, camera, padding=0.02):
+        cameraShape = cmds.ls(camera, dag=1, type='camera')[0]
+        cameraTransform = cmds.listRelatives(cameraShape, p=1)[0]
+        imps = [imp for imp in self.findImagePlanes()
+                if cameraShape in cmds.ls(cmds.imagePlane(imp, q=1, camera=1) or [], dag=1, type='camera')]
+        if not imps:
+            return []
+
+        aspects = []
+        for imp in imps:
+            coverage = cmds.getAttr('%s.coverage'%imp)[0]
+            if coverage[0] > 0 and coverage[1] > 0:
+                aspects.append(float(coverage[0])/coverage[1])
+            else:
+                aspects.append(cmds.getAttr('%s.sizeX'%imp)/cmds.getAttr('%s.sizeY'%imp))
+
+        #lay out on the rendered part of the film back, not the full aperture
+        frameWidth, frameHeight = [float(value) for value in cameraGate(cameraShape)]
+        layout = gridLayout(aspects, frameWidth, frameHeight, padding)
+
+        #planes driven by a mover get their mover placed in one conversion, at the depth the mover already has
+        focalLength = cmds.getAttr('%s.focalLength'%cameraShape)
+        moverPlanes = [i for i, imp in enumerate(imps) if cmds.objExists('%s_mover'%imp)]
+        if moverPlanes:
+            depths = [-cmds.getAttr('%s_mover.translateZ'%imps[i]) for i in moverPlanes]
+            moverTranslates, moverScales = planeToMover([layout[i][:2] for i in moverPlanes],
+                                                        [layout[i][2:] for i in moverPlanes],
+                                                        focalLength, depths)
+            movers = dict(zip(moverPlanes, zip(depths, moverTranslates, moverScales)))
+        else:
+            movers = {}
+
+        print('imp: Auto layout of %d image planes on %s'%(len(imps), cameraTransform))
+        cmds.undoInfo(openChunk=True)
+        try:
+            for i, (imp, (offsetX, offsetY, sizeX, sizeY)) in enumerate(zip(imps, layout)):
+                # size is only used when fit is To Size, otherwise every plate fills the gate
+                cmds.setAttr('%s.fit'%imp, 4)
+                mover = '%s_mover'%imp
+                if i in movers:
+                    # keep the multiplyDivide in sync so older movers built with another factor still land on the plate
+                    depth, moverTranslate, moverScale = movers[i]
+                    factor = moverFactor(focalLength, depth)
+                    cmds.setAttr('%s_moveroffset.input2X'%imp, factor)
+                    cmds.setAttr('%s_moveroffset.input2Y'%imp, factor)
+                    cmds.setAttr('%s.translateX'%mover, float(moverTranslate[0]))
+                    cmds.setAttr('%s.translateY'%mover, float(moverTranslate[1]))
+                    cmds.setAttr('%s.scale'%mover, *[float(value) for value in moverScale], type='double3')
+                else:
+                    cmds.setAttr('%s.offset'%imp, offsetX, offsetY, type='double2')
+                    cmds.setAttr('%s.size'%imp, sizeX, sizeY, type='double2')
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        return imps
+
+    ###########################
+    # import audio, link it to the plate camera and show it in the time slider
+    ###########################
+    def importAudio(self, path, camera):
+        cameraShape = cmds.ls(camera, dag=1, type='camera')[0]
+        print('imp: Importing audio %s for %s'%(path, cameraShape))
+        audio = cmds.sound(file=path, offset=cmds.playbackOptions(q=1, minTime=1), name='%s_audio'%self.nameFromFile(path))
+
+        #link to camera with a message connection
+        if not cmds.attributeQuery('plateCamera', node=audio, exists=True):
+            cmds.addAttr(audio, longName='plateCamera', attributeType='message')
+        cmds.connectAttr('%s.message'%cameraShape, '%s.plateCamera'%audio, f=1)
+
+        playBackSlider = mel.eval('$tmpVar=$gPlayBackSlider')
+        cmds.timeControl(playBackSlider, e=1, sound=audio, displaySound=True)
+
+        peaks = None
+        if np is None:
+            sys.stderr.write('imp: numpy not available, skipping waveform peaks for %s.'%path)
+        elif path.lower().endswith('.wav'):
+            #the audio node is already in the scene, a peak failure must not fail the import
+            cmds.waitCursor(state=True)
+            try:
+                peaks = audioPeaks(audio)
+            except (wave.Error, ValueError, IOError, OSError) as e:
+                sys.stderr.write('imp: Could not compute waveform peaks for %s: %s'%(path, e))
+                peaks = None
+            finally:
+                cmds.waitCursor(state=False)
+        return audio, peaks
+
     def translateImageplane(self, translation, scale ):
             imp = self.currentImgPlane[0]
             try:
@@ -443,33 +1279,35 @@ class ImagePlaneMngWindow(object):
 
 
     ###########################
-    # fill option list with all scene image planes, sets first as active
+    # fill option list with all scene image planes, restores stored selection or sets first as active
     ###########################
-    def imp_option_list(self,*args):
+    def imp_option_list(self, current=None, *args):
 
         del  self.listOfImagePlanes[:]
         self.imgplanesOptionMenu.clear()
 
         # creates a list of existing image planes and update Image Plane Option menu
-        self.listOfImagePlanes =[i for i in pm.ls(type='imagePlane')]
+        self.listOfImagePlanes = [pm.imagePlane(i, query=True, name=True)[0] for i in pm.ls(type='imagePlane')]
+        if current is None:
+            current = loadSelection()
 
         _logger.debug("imp_option_list: %s"%self.listOfImagePlanes)
         if len(self.listOfImagePlanes)>0:
-            self.currentImgPlane = pm.imagePlane(self.listOfImagePlanes[0], query=True, name=True)
-            for item in self.listOfImagePlanes:
-                _logger.debug('imp is %s'%pm.imagePlane(item, query=True, name=True))
-                imp = pm.imagePlane(item, query=True, name=True)
-                pm.menuItem(l=imp[0],parent=self.imgplanesOptionMenu)
+            if current not in self.listOfImagePlanes:
+                current = self.listOfImagePlanes[0]
+            self.currentImgPlane = [current]
+            for imp in self.listOfImagePlanes:
+                pm.menuItem(l=imp,parent=self.imgplanesOptionMenu)
 
             # set active menu item to current image plane
             _logger.debug('Current Imageplane: %s'%self.currentImgPlane)
             pm.optionMenu(self.imgplanesOptionMenu, e=True, value="%s"%self.currentImgPlane[0])
+            saveSelection(current)
 
         else:
             pm.menuItem(l="No Image Planes", parent=self.imgplanesOptionMenu)
             self.currentImgPlane = False
 
-
     def nameFromFile(self,pathname):
         try:
             fpPathObj = pu.path(pathname)
@@ -577,7 +1415,7 @@ class ImagePlaneMngWindow(object):
                     _logger.debug('Setting to .mov %s ' % self.currentImgPlane)
                     pm.setAttr('%s.type'%self.currentImgPlane, 2)
 
-                self.imp_option_list() #update option menu
+                self.imp_option_list(str(self.currentImgPlane)) #update option menu
                 pm.textFieldButtonGrp(self.ImpPathTxt,e=True,text=self.currentImgPath)
 
                 #update edit image plane frame
@@ -621,6 +1459,7 @@ class ImagePlaneMngWindow(object):
 
         # update currenImpPlane
         self.currentImgPlane = currentImpItem
+        saveSelection(self.currentImgPlane[0])
         self.updateImagePlaneEditSliders()
 
     def on_opacity_change(self, *args):
@@ -697,30 +1536,57 @@ class ImagePlaneMngWindow(object):
     def on_disconnectMover_btn(self, *args):
         self.disconnectMover()
 
+    def on_audio_btn(self, *args):
+        audioFile = pm.fileDialog2(fileMode=1, fileFilter='Audio (*.wav *.aif *.aiff)')
+        if audioFile is None or len(audioFile)<1: return
+        if self.currentImgPlane:
+            camera = cmds.imagePlane(self.currentImgPlane[0], q=1, camera=1)
+        else:
+            camera = 'persp'
+        try:
+            self.importAudio(audioFile[0], camera)
+        except:
+            sys.stderr.write('Error importing audio %s.'%audioFile[0])
+            return
+        pm.text(self.audioTxt, e=1, label='  '.join([audioLabel(audio) for audio in cmds.ls(type='audio')]))
+
+    def on_autolayout_btn(self, *args):
+        camera = cmds.imagePlane(self.currentImgPlane[0], q=1, camera=1)
+        self.autoLayout(camera)
+        self.updateImagePlaneEditSliders()
+
     def on_retarget_btn(self, *args):
         sourcecam = pm.imagePlane(self.currentImgPlane, q=1, camera=1)
         targetcam = pm.optionMenu(self.cameraRetargetMenu, q=1, v=1)
         confirm = pm.confirmDialog( title='Confirm', message='Retargeting image plane %s from %s to %s'%(self.currentImgPlane, sourcecam, targetcam), button=['Yes','No'], defaultButton='Yes', cancelButton='No', dismissString='No' )
 
         if confirm == 'Yes':
-            moverTranslation = None
-            moverScale = None
-            #retarget mover
-            if pm.objExists('%s_mover'%self.currentImgPlane[0]):
-                mover = '%s_mover'%self.currentImgPlane[0]
-                moverTranslation = pm.xform(mover, q=1, translation=1)
-                moverScale = pm.xform(mover, q=1, scale=1)
-                #pm.parent(mover, pm.listRelatives(targetcam, p=1))
-                #pm.xform(mover, translation=moverTranslation)
-                #pm.xform(mover, scale=moverScale)
-                pm.delete('%s_mover'%self.currentImgPlane[0])
-                pm.delete('%s_moveroffset'%self.currentImgPlane[0])
+            imp = self.currentImgPlane[0]
+            mover = '%s_mover'%imp
+            if cmds.objExists('%s.%s'%(mover, MOVER_TAG)):
+                #read the framing back from the mover
+                sourceShape = cmds.ls(sourcecam, dag=1, type='camera')[0]
+                offset, size = moverToPlane(cmds.getAttr('%s.translate'%mover)[0], cmds.getAttr('%s.scale'%mover)[0],
+                                            cmds.getAttr('%s.focalLength'%sourceShape))
+                offset, size = offset[0], size[0]
+            else:
+                #untagged movers may use another factor, the driven plane holds the current framing
+                offset = [pm.getAttr('%s.offsetX'%imp), pm.getAttr('%s.offsetY'%imp)]
+                size = [pm.getAttr('%s.sizeX'%imp), pm.getAttr('%s.sizeY'%imp)]
+            if pm.objExists(mover):
+                pm.delete('%s_mover'%imp)
+                pm.delete('%s_moveroffset'%imp)
 
             print 'ipm: retargeting image plane %s from %s to %s'%(self.currentImgPlane, sourcecam, targetcam)
+            #keep the apparent framing by converting between the film gates of both cameras
+            offset, size = retargetPlanes(offset, size, cameraGate(sourcecam), cameraGate(targetcam))
             pm.imagePlane(self.currentImgPlane, e=1, camera=targetcam)
-            #self.translateImageplane(moverTranslation, moverScale)
+            pm.setAttr('%s.offsetX'%imp, float(offset[0]))
+            pm.setAttr('%s.offsetY'%imp, float(offset[1]))
+            pm.setAttr('%s.sizeX'%imp, float(size[0]))
+            pm.setAttr('%s.sizeY'%imp, float(size[1]))
 
-            self.createMover(moverTranslation, moverScale)
+            self.createMover()
 
             return targetcam
             #except:
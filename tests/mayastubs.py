@@ -0,0 +1,33 @@
+"""Import mo_imageplaneManager outside maya with empty pymel/maya stand-ins."""
+import os
+import sys
+import types
+
+STUBS = ('pymel', 'pymel.core', 'pymel.util', 'maya', 'maya.cmds', 'maya.mel', 'maya.api', 'maya.api.OpenMaya')
+_installed = []
+
+
+def importManager():
+    """Install the stubs that are missing and return the freshly imported module."""
+    for name in STUBS:
+        if name not in sys.modules:
+            sys.modules[name] = types.ModuleType(name)
+            _installed.append(name)
+    for name in STUBS:
+        parent, _, child = name.rpartition('.')
+        if parent:
+            setattr(sys.modules[parent], child, sys.modules[name])
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    sys.modules.pop('mo_imageplaneManager', None)
+    import mo_imageplaneManager
+    return mo_imageplaneManager
+
+
+def removeStubs():
+    """Drop the stubs installed by importManager and the module imported against them."""
+    sys.modules.pop('mo_imageplaneManager', None)
+    while _installed:
+        sys.modules.pop(_installed.pop(), None)
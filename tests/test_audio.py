@@ -0,0 +1,91 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import wave
+
+import numpy as np
+
+import mayastubs
+
+ipm = None
+
+
+def setUpModule():
+    global ipm
+    ipm = mayastubs.importManager()
+
+
+def tearDownModule():
+    mayastubs.removeStubs()
+
+
+def pcmBytes(samples, sampleWidth):
+    # integer samples to little endian pcm, 8 bit wav is unsigned
+    if sampleWidth == 1:
+        return b''.join(struct.pack('<B', value+128) for value in samples)
+    if sampleWidth == 3:
+        return b''.join(struct.pack('<i', value)[:3] for value in samples)
+    return b''.join(struct.pack({2: '<h', 4: '<i'}[sampleWidth], value) for value in samples)
+
+
+class TestReadWavPeaks(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def writeWav(self, samples, sampleWidth, channels=1, rate=1000):
+        path = os.path.join(self.tempDir, 'test_%d.wav' % sampleWidth)
+        wav = wave.open(path, 'wb')
+        try:
+            wav.setnchannels(channels)
+            wav.setsampwidth(sampleWidth)
+            wav.setframerate(rate)
+            wav.writeframes(pcmBytes(samples, sampleWidth))
+        finally:
+            wav.close()
+        return path
+
+    def test_full_scale_per_width(self):
+        for sampleWidth in (1, 2, 3, 4):
+            fullScale = 1 << (8*sampleWidth - 1)
+            # 1000 Hz at 100 peaks per second gives 10 frames per peak
+            samples = ([-fullScale] + [0]*8 + [fullScale-1]) * 3
+            peaks = ipm.readWavPeaks(self.writeWav(samples, sampleWidth))
+            self.assertEqual(peaks.shape, (3, 2))
+            np.testing.assert_allclose(peaks[:, 0], -1.0)
+            np.testing.assert_allclose(peaks[:, 1], (fullScale-1)/float(fullScale), rtol=1e-6)
+
+    def test_24_bit_sign_extension(self):
+        samples = [-1, 1, -8388608, 8388607, -4096, 4096, 0, 0, 0, 0]
+        peaks = ipm.readWavPeaks(self.writeWav(samples, 3))
+        np.testing.assert_allclose(peaks, [[-1.0, 8388607/8388608.0]], rtol=1e-6)
+        peaks = ipm.readWavPeaks(self.writeWav([-1, -2, -3, -4, -5, -6, -7, -8, -9, -10], 3))
+        np.testing.assert_allclose(peaks, [[-10/8388608.0, -1/8388608.0]], rtol=1e-6)
+
+    def test_partial_tail_peak(self):
+        # 25 frames: two full peaks of 10 frames and a tail of 5
+        samples = [100]*10 + [-200]*10 + [0, 300, 0, -50, 0]
+        peaks = ipm.readWavPeaks(self.writeWav(samples, 2))
+        np.testing.assert_allclose(peaks * 32768, [[100, 100], [-200, -200], [-50, 300]], rtol=1e-5)
+
+    def test_chunks_and_channels(self):
+        # small chunks so peaks span several reads, stereo min/max over both channels
+        samples = []
+        for frame in range(95):
+            samples += [frame, -frame]
+        peaks = ipm.readWavPeaks(self.writeWav(samples, 2, channels=2), chunkPeaks=3)
+        self.assertEqual(peaks.shape, (10, 2))
+        np.testing.assert_allclose(peaks[0] * 32768, [-9, 9], rtol=1e-5)
+        np.testing.assert_allclose(peaks[-1] * 32768, [-94, 94], rtol=1e-5)
+
+    def test_empty(self):
+        self.assertEqual(ipm.readWavPeaks(self.writeWav([], 2)).shape, (0, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
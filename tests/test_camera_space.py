@@ -0,0 +1,98 @@
+import unittest
+
+import numpy as np
+
+import mayastubs
+
+ipm = None
+
+
+def setUpModule():
+    global ipm
+    ipm = mayastubs.importManager()
+
+
+def tearDownModule():
+    mayastubs.removeStubs()
+
+
+class TestMoverConversion(unittest.TestCase):
+
+    def test_round_trip(self):
+        rng = np.random.RandomState(0)
+        offset = rng.uniform(-1, 1, (50, 2))
+        size = rng.uniform(0.1, 2, (50, 2))
+        focalLength = rng.uniform(12, 200, 50)
+        translate, scale = ipm.planeToMover(offset, size, focalLength)
+        planeOffset, planeSize = ipm.moverToPlane(translate, scale, focalLength)
+        np.testing.assert_allclose(planeOffset, offset, atol=1e-12)
+        np.testing.assert_allclose(planeSize, size, atol=1e-12)
+
+    def test_default_depth_is_half_focal_length(self):
+        translate, scale = ipm.planeToMover([0.1, -0.2], [1.5, 1.0], 35.0)
+        np.testing.assert_allclose(translate, [[1.27, -2.54, -17.5]])
+        np.testing.assert_allclose(scale, [[1.5, 1.0, 1.0]])
+
+
+class TestFilmGate(unittest.TestCase):
+    # 1.417 x 0.945 back has an aspect of about 1.5
+    hfa, vfa = 1.417, 0.945
+
+    def gate(self, filmFit, renderAspect):
+        return [float(value) for value in ipm.filmGate(self.hfa, self.vfa, filmFit, renderAspect)]
+
+    def test_horizontal(self):
+        self.assertEqual(self.gate(ipm.FILMFIT_HORIZONTAL, 1.778), [self.hfa, self.hfa/1.778])
+        self.assertEqual(self.gate(ipm.FILMFIT_HORIZONTAL, 1.0), [self.hfa, self.hfa/1.0])
+
+    def test_vertical(self):
+        self.assertEqual(self.gate(ipm.FILMFIT_VERTICAL, 1.778), [self.vfa*1.778, self.vfa])
+        self.assertEqual(self.gate(ipm.FILMFIT_VERTICAL, 1.0), [self.vfa*1.0, self.vfa])
+
+    def test_fill(self):
+        # wider render fits horizontally, narrower vertically, always inside the back
+        self.assertEqual(self.gate(ipm.FILMFIT_FILL, 1.778), [self.hfa, self.hfa/1.778])
+        self.assertEqual(self.gate(ipm.FILMFIT_FILL, 1.0), [self.vfa*1.0, self.vfa])
+
+    def test_overscan(self):
+        # wider render fits vertically, narrower horizontally, always covering the back
+        self.assertEqual(self.gate(ipm.FILMFIT_OVERSCAN, 1.778), [self.vfa*1.778, self.vfa])
+        self.assertEqual(self.gate(ipm.FILMFIT_OVERSCAN, 1.0), [self.hfa, self.hfa/1.0])
+
+    def test_lens_squeeze(self):
+        width, height = ipm.filmGate(self.hfa, self.vfa, ipm.FILMFIT_HORIZONTAL, 2.0, lensSqueeze=2.0)
+        self.assertAlmostEqual(float(width), self.hfa*2.0)
+        self.assertAlmostEqual(float(height), self.hfa)
+
+    def test_arrays(self):
+        width, height = ipm.filmGate(self.hfa, self.vfa, [0, 1, 2, 3], 1.778)
+        np.testing.assert_allclose(width, [self.hfa, self.hfa, self.vfa*1.778, self.vfa*1.778])
+        np.testing.assert_allclose(height, [self.hfa/1.778, self.hfa/1.778, self.vfa, self.vfa])
+
+
+class TestRetarget(unittest.TestCase):
+
+    def test_keeps_framing(self):
+        sourceGate = ipm.filmGate(1.417, 0.945, ipm.FILMFIT_FILL, 1.778)
+        targetGate = ipm.filmGate(0.980, 0.735, ipm.FILMFIT_VERTICAL, 1.778)
+        # plate filling the right half of the source frame
+        offset = [float(sourceGate[0])/4, 0.0]
+        size = [float(sourceGate[0])/2, float(sourceGate[1])]
+        newOffset, newSize = ipm.retargetPlanes(offset, size, sourceGate, targetGate)
+        np.testing.assert_allclose(newOffset, [float(targetGate[0])/4, 0.0])
+        np.testing.assert_allclose(newSize, [float(targetGate[0])/2, float(targetGate[1])])
+
+    def test_round_trip(self):
+        rng = np.random.RandomState(0)
+        offset = rng.uniform(-1, 1, (4, 2))
+        size = rng.uniform(0.1, 2, (4, 2))
+        sourceGate = ipm.filmGate(1.417, 0.945, [0, 1, 2, 3], 1.778)
+        targetGate = ipm.filmGate(0.980, 0.735, [3, 2, 1, 0], 2.39)
+        there = ipm.retargetPlanes(offset, size, sourceGate, targetGate)
+        back = ipm.retargetPlanes(there[0], there[1], targetGate, sourceGate)
+        np.testing.assert_allclose(back[0], offset)
+        np.testing.assert_allclose(back[1], size)
+
+
+if __name__ == '__main__':
+    unittest.main()
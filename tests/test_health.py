@@ -0,0 +1,87 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import mayastubs
+
+ipm = None
+
+
+def setUpModule():
+    global ipm
+    ipm = mayastubs.importManager()
+
+
+def tearDownModule():
+    mayastubs.removeStubs()
+
+
+class TestSequenceLength(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        ipm._dirCache.clear()
+        ipm._sequenceCache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def touch(self, *names):
+        for name in names:
+            open(os.path.join(self.tempDir, name), 'w').close()
+
+    def test_unpadded(self):
+        self.touch(*['img.%d.png' % frame for frame in range(1, 121)])
+        self.assertEqual(ipm.sequenceLength(os.path.join(self.tempDir, 'img.1.png')), 120)
+        self.assertEqual(ipm.sequenceLength(os.path.join(self.tempDir, 'img.57.png')), 120)
+
+    def test_padded(self):
+        self.touch('plate.0001.exr', 'plate.0002.exr', 'plate.0003.exr', 'plate.01.exr', 'plate.0001.jpg', 'other.0001.exr')
+        self.assertEqual(ipm.sequenceLength(os.path.join(self.tempDir, 'plate.0002.exr')), 3)
+
+    def test_single_image(self):
+        self.touch('still.png')
+        self.assertEqual(ipm.sequenceLength(os.path.join(self.tempDir, 'still.png')), 1)
+
+
+class TestImageResolution(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def write(self, name, data):
+        path = os.path.join(self.tempDir, name)
+        f = open(path, 'wb')
+        f.write(data)
+        f.close()
+        return path
+
+    def test_png(self):
+        data = b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>II', 1920, 1080) + b'\x08\x02\x00\x00\x00'
+        self.assertEqual(ipm.imageResolution(self.write('a.png', data)), (1920, 1080))
+
+    def test_jpeg(self):
+        app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'\x00'*14
+        sof = b'\xff\xc0' + struct.pack('>HBHH', 17, 8, 720, 1280) + b'\x00'*12
+        self.assertEqual(ipm.imageResolution(self.write('a.jpg', b'\xff\xd8' + app0 + sof)), (1280, 720))
+
+    def test_exr(self):
+        def attr(name, attrType, value):
+            return name + b'\x00' + attrType + b'\x00' + struct.pack('<i', len(value)) + value
+        header = b'\x76\x2f\x31\x01\x02\x00\x00\x00' + attr(b'channels', b'chlist', b'\x00'*10)
+        data = header + attr(b'dataWindow', b'box2i', struct.pack('<iiii', 0, 0, 2047, 857)) + b'\x00'
+        self.assertEqual(ipm.imageResolution(self.write('a.exr', data)), (2048, 858))
+
+    def test_truncated_and_missing(self):
+        truncated = b'\x76\x2f\x31\x01\x02\x00\x00\x00' + b'channels\x00chlist\x00' + struct.pack('<i', 2)
+        self.assertEqual(ipm.imageResolution(self.write('b.exr', truncated)), None)
+        self.assertEqual(ipm.imageResolution(os.path.join(self.tempDir, 'missing.png')), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
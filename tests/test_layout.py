@@ -0,0 +1,56 @@
+import unittest
+
+import mayastubs
+
+ipm = None
+
+
+def setUpModule():
+    global ipm
+    ipm = mayastubs.importManager()
+
+
+def tearDownModule():
+    mayastubs.removeStubs()
+
+
+class TestGridLayout(unittest.TestCase):
+    eps = 1e-9
+
+    def check(self, aspects, frameWidth, frameHeight):
+        layout = ipm.gridLayout(aspects, frameWidth, frameHeight)
+        self.assertEqual(len(layout), len(aspects))
+        boxes = []
+        for aspect, (offsetX, offsetY, sizeX, sizeY) in zip(aspects, layout):
+            self.assertAlmostEqual(sizeX/sizeY, aspect)
+            box = (offsetX-sizeX/2, offsetY-sizeY/2, offsetX+sizeX/2, offsetY+sizeY/2)
+            # inside the gate
+            self.assertGreaterEqual(box[0], -frameWidth/2-self.eps)
+            self.assertGreaterEqual(box[1], -frameHeight/2-self.eps)
+            self.assertLessEqual(box[2], frameWidth/2+self.eps)
+            self.assertLessEqual(box[3], frameHeight/2+self.eps)
+            boxes.append(box)
+        # no two plates overlap
+        for i, a in enumerate(boxes):
+            for b in boxes[i+1:]:
+                overlap = min(a[2], b[2]) > max(a[0], b[0])+self.eps and min(a[3], b[3]) > max(a[1], b[1])+self.eps
+                self.assertFalse(overlap, '%s overlaps %s' % (a, b))
+
+    def test_empty(self):
+        self.assertEqual(ipm.gridLayout([], 1.417, 0.945), [])
+
+    def test_single(self):
+        self.check([1.778], 1.417, 0.797)
+
+    def test_uniform(self):
+        self.check([1.5]*7, 1.417, 0.945)
+
+    def test_mixed_aspects(self):
+        self.check([0.5, 1.0, 1.778, 2.39, 1.333]*9, 1.417, 0.797)
+
+    def test_many(self):
+        self.check([1.0 + (i % 7)*0.25 for i in range(150)], 1.417, 0.945)
+
+
+if __name__ == '__main__':
+    unittest.main()